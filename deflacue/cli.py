@@ -16,6 +16,10 @@ def main():
         '-d', help='Absolute or relative destination path for output audio file(s).')
     argparser.add_argument(
         '-e', help='Cue Sheet file(s) encoding.')
+    argparser.add_argument(
+        '-j', help='Number of parallel extraction jobs. Defaults to CPU count.', type=int)
+    argparser.add_argument(
+        '--force', help='Extract tracks even if their target files already exist.', action='store_true')
     argparser.add_argument(
         '--dry', help='Perform the dry run with no changes done to filesystem.', action='store_true')
     argparser.add_argument(
@@ -30,6 +34,12 @@ def main():
     if parsed.d is not None:
         kwargs['dest_path'] = parsed.d
 
+    if parsed.j is not None:
+        kwargs['jobs'] = parsed.j
+
+    if parsed.force:
+        kwargs['force'] = True
+
     if parsed.debug:
         kwargs['use_logging'] = logging.DEBUG
 
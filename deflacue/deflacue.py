@@ -9,18 +9,22 @@ deflacue can function both as a Python module and in command line mode.
 """
 import logging
 import os
+import shutil
+import threading
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from subprocess import Popen, PIPE
+from subprocess import run, DEVNULL
+from tempfile import TemporaryDirectory
 from typing import List, Dict, Union, Optional
 
 from .exceptions import DeflacueError
-from .parser import CueParser
+from .parser import CueData, CueParser
 
 LOGGER = logging.getLogger(__name__)
 TypePath = Union[str, Path]
 
-
 COMMENTS_CUE_TO_VORBIS = {
     'TRACK_NUM': 'TRACKNUMBER',
     'TITLE': 'TITLE',
@@ -33,6 +37,24 @@ COMMENTS_CUE_TO_VORBIS = {
 }
 """Cue REM commands to Vorbis tags."""
 
+_COMMENT_PAIRS = tuple(COMMENTS_CUE_TO_VORBIS.items())
+"""Same mapping as a tuple of pairs for the per-track hot path."""
+
+
+@lru_cache(maxsize=None)
+def _parse_cue(fpath: str, mtime: float, encoding: Optional[str]) -> CueData:
+    """Parses a .cue file. Results are memoized, so repeated
+    runs over the same (unchanged) file skip I/O and parsing.
+
+    :param fpath: .cue filepath
+
+    :param mtime: File modification time, invalidates stale cache entries.
+
+    :param encoding: Encoding used for the .cue file.
+
+    """
+    return CueParser.from_file(Path(fpath), encoding=encoding).run()
+
 
 class Deflacue:
     """deflacue functionality is encapsulated in this class.
@@ -49,6 +71,7 @@ class Deflacue:
     """
     _dry_run = False  # Some lengthy shell command won't be executed on dry run.
     _target_default = 'deflacue'
+    _split_threshold = 44100 * 600  # Tracks longer than this (samples) are extracted in sub-chunks.
 
     def __init__(
         self,
@@ -56,7 +79,9 @@ class Deflacue:
         *,
         dest_path: TypePath = None,
         encoding: str = None,
-        use_logging: int = logging.INFO
+        use_logging: int = logging.INFO,
+        jobs: int = None,
+        force: bool = False
     ):
         """Prepares deflacue to for audio processing.
 
@@ -73,11 +98,44 @@ class Deflacue:
             produced by the application are logged with `logging` module.
             Examples: logging.INFO, logging.DEBUG.
 
+        :param jobs: Number of audio extraction jobs to run in parallel.
+            If None, the number of CPUs available is used.
+
+        :param force: If True extract tracks even if their target files
+            already exist. Otherwise such tracks are skipped, which makes
+            re-runs after an interruption incremental.
+
         """
         src = Path(source_path).absolute()
         self.path_source: Path = src
         self.path_target: Optional[Path] = dest_path
         self.encoding = encoding
+        if jobs is not None and jobs < 1:
+            raise DeflacueError(f'Jobs number must be positive, got {jobs}.')
+
+        self.jobs = jobs or os.cpu_count() or 1
+        self._force = force
+        self._known_dirs = set()
+        self._sox_available: Optional[bool] = None
+        # Bounds the number of SoX processes run at once whatever
+        # the level (cue sheet, track) jobs are spawned at.
+        self._sox_semaphore = threading.BoundedSemaphore(self.jobs)
+
+        # An absolute executable path lets subprocess use its
+        # posix_spawn() fast path instead of fork() on spawn.
+        self._sox_executable = shutil.which('sox') or 'sox'
+
+        self._sox_base = [self._sox_executable, '-V1']
+
+        if self.jobs > 1:
+            # Keep every SoX process on one thread when several of them
+            # run at once not to oversubscribe the CPU.
+            self._sox_base.append('--single-threaded')
+
+        else:
+            # A lone SoX process is free to pipeline
+            # decode/effects/encode on its own threads.
+            self._sox_base.append('--multi-threaded')
 
         if use_logging:
             self._configure_logging(use_logging)
@@ -89,25 +147,32 @@ class Deflacue:
 
         if dest_path is not None:
             self.path_target = Path(dest_path).absolute()
-            os.chdir(src)
 
     def _process_command(
         self,
-        command: str,
+        command: List[str],
         *,
         stdout=None,
+        stderr=None,
         suppress_dry_run: bool = False
     ) -> int:
-        """Executes shell command with subprocess.Popen.
+        """Executes command with subprocess.run.
         Returns status code.
 
         """
-        LOGGER.debug(f'Executing shell command: {command}')
+        LOGGER.debug('Executing command: %s', command)
 
         if not self._dry_run or suppress_dry_run:
-            prc = Popen(command, shell=True, stdout=stdout)
-            prc.communicate()
-            return prc.returncode
+
+            try:
+                return run(command, stdout=stdout, stderr=stderr, check=False).returncode
+
+            except OSError as e:
+                # E.g. the SoX binary is missing. Report the shell's
+                # command-not-found status instead of raising, so that
+                # availability checks and pool threads degrade gracefully.
+                LOGGER.error('Unable to execute `%s`: %s', command[0], e)
+                return 127
 
         return 0
 
@@ -118,11 +183,12 @@ class Deflacue:
 
     def _create_target_path(self, path: Optional[Path]):
         """Creates a directory for target files."""
-        if self._dry_run or not path:
+        if self._dry_run or not path or path in self._known_dirs:
             return
 
         LOGGER.debug(f'Creating target path: {path} ...')
         os.makedirs(path, exist_ok=True)
+        self._known_dirs.add(path)
 
     def set_dry_run(self):
         """Sets deflacue into dry run mode, when all requested actions
@@ -146,10 +212,13 @@ class Deflacue:
                 files[path] = [path / f for f in dir_files]
 
         else:
-            files[self.path_source] = [
-                f for f in self.path_source.iterdir()
-                if f.is_file()
-            ]
+            # scandir() tells files from directories without
+            # an extra stat() per entry.
+            with os.scandir(self.path_source) as entries:
+                files[self.path_source] = [
+                    Path(entry.path) for entry in entries
+                    if entry.is_file()
+                ]
 
         return files
 
@@ -170,16 +239,70 @@ class Deflacue:
             if path.name == self._target_default:
                 continue
 
-            for f in sorted(files_dict[path]):
-                if f.suffix == '.cue':
-                    files_filtered[path].append(f)
+            # Filter before sorting not to waste comparisons on files
+            # of unsupported types.
+            cue_files = [f for f in files_dict[path] if f.name.endswith('.cue')]
+
+            if cue_files:
+                cue_files.sort()
+                files_filtered[path] = cue_files
 
         return files_filtered
 
+    def get_cue_files(self, *, recursive: bool = False) -> Dict[Path, List[Path]]:
+        """Creates and returns dictionary of .cue files under the source path
+        indexed by directories. Enumeration and filtering are done in one pass.
+
+        :param recursive: if True search is also performed within subdirectories.
+
+        """
+        LOGGER.info(f'Enumerating .cue files under the source path (recursive={recursive}) ...')
+
+        target_default = self._target_default
+
+        files = defaultdict(list)
+        stack = [self.path_source]
+
+        while stack:
+            current = stack.pop()
+
+            try:
+                entries = os.scandir(current)
+
+            except OSError as e:
+                # Unreadable subdirectories are skipped (as os.walk would do),
+                # but an unreadable source path itself is still an error.
+                if current == self.path_source:
+                    raise
+
+                LOGGER.warning('Skipped unreadable directory `%s`: %s', current, e)
+                continue
+
+            with entries:
+
+                for entry in entries:
+
+                    if entry.is_dir(follow_symlinks=False):
+                        # Output of previous runs is pruned without ever descending into it.
+                        if recursive and entry.name != target_default:
+                            stack.append(current / entry.name)
+
+                    elif entry.name.endswith('.cue'):
+                        files[current].append(current / entry.name)
+
+        for cue_files in files.values():
+            cue_files.sort()
+
+        return files
+
     def sox_check_is_available(self) -> bool:
-        """Checks whether SoX is available."""
-        result = self._process_command('sox -h', stdout=PIPE, suppress_dry_run=True)
-        return result == 0
+        """Checks whether SoX is available. The result is cached."""
+        if self._sox_available is None:
+            result = self._process_command(
+                [self._sox_executable, '-h'], stdout=DEVNULL, stderr=DEVNULL, suppress_dry_run=True)
+            self._sox_available = result == 0
+
+        return self._sox_available
 
     def sox_extract_audio(
         self,
@@ -203,35 +326,128 @@ class Deflacue:
         :param metadata: Additional data (tags) dict.
 
         """
-        LOGGER.info(f'  Extracting `{target_file.name}` ...')
+        LOGGER.info('  Extracting `%s` ...', target_file.name)
 
         chunk_length_samples = ''
         if pos_end_samples:
             chunk_length_samples = f'{pos_end_samples - pos_start_samples}s'
 
-        add_comment = ''
+        add_comment = []
         if metadata is not None:
-            LOGGER.debug(f'Metadata: {metadata}\n')
+            LOGGER.debug('Metadata: %s\n', metadata)
 
-            for key, val in COMMENTS_CUE_TO_VORBIS.items():
-                val_meta = metadata.get(key)
-                if val_meta:
-                    add_comment = f'--add-comment="{val}={val_meta}" {add_comment}'
+            add_comment = [
+                f'--add-comment={val}={metadata[key]}'
+                for key, val in _COMMENT_PAIRS
+                if metadata.get(key)
+            ]
 
         LOGGER.debug(
             'Extraction information:\n'
-            f'      Source file: {source_file}\n'
-            f'      Start position: {pos_start_samples} samples\n'
-            f'      End position: {pos_end_samples} samples\n'
-            f'      Length: {chunk_length_samples} sample(s)')
+            '      Source file: %s\n'
+            '      Start position: %s samples\n'
+            '      End position: %s samples\n'
+            '      Length: %s sample(s)',
+            source_file, pos_start_samples, pos_end_samples, chunk_length_samples)
+
+        length_samples = (pos_end_samples - pos_start_samples) if pos_end_samples else 0
+
+        # Extract into a temporary name and rename only on success, so that
+        # an interrupted run never leaves a truncated file under the final
+        # name, which the skip-existing check would treat as complete.
+        tmp_file = target_file.with_name(f'{target_file.name}.tmp.flac')
+
+        if not self._dry_run and self.jobs > 1 and length_samples > self._split_threshold:
+            result = self._sox_extract_chunked(
+                source_file=source_file,
+                pos_start_samples=pos_start_samples,
+                length_samples=length_samples,
+                target_file=tmp_file,
+                add_comment=add_comment,
+            )
+
+        else:
+            command = [
+                *self._sox_base, str(source_file),
+                '--comment=', *add_comment, str(tmp_file),
+                'trim', f'{pos_start_samples}s',
+            ]
+            if chunk_length_samples:
+                command.append(chunk_length_samples)
+
+            result = self._process_sox_command(command)
+
+        if not self._dry_run and tmp_file.exists():
+            # Leftovers from a previously interrupted run must never be
+            # promoted by a dry run which has not written anything itself.
+
+            if result == 0:
+                os.replace(tmp_file, target_file)
+
+            else:
+                tmp_file.unlink()
+
+    def _process_sox_command(self, command: List[str]) -> int:
+        """Executes a SoX command honouring the parallel process limit.
+
+        :param command:
+
+        """
+        with self._sox_semaphore:
+            # The output is never read, so sink it instead of piping.
+            return self._process_command(command, stdout=DEVNULL, stderr=DEVNULL)
+
+    def _sox_extract_chunked(
+        self,
+        *,
+        source_file: Path,
+        pos_start_samples: int,
+        length_samples: int,
+        target_file: Path,
+        add_comment: List[str]
+    ) -> int:
+        """Extracts a long audio chunk as several parallel SoX invocations.
+        Returns the concatenation command status code.
+
+        Sub-chunks are extracted into temporary files and then
+        concatenated into the target.
+
+        :param source_file: Source audio file path
+
+        :param pos_start_samples: Trim position start (samples)
+
+        :param length_samples: Chunk length (samples)
+
+        :param target_file: Trimmed audio file path
+
+        :param add_comment: SoX comment (tags) arguments.
 
-        command = (
-            f'sox -V1 "{source_file}" '
-            f'--comment="" {add_comment} "{target_file}" '
-            f'trim {pos_start_samples}s {chunk_length_samples}'
-        )
+        """
+        chunks = min(self.jobs, (length_samples // self._split_threshold) + 1)
+        chunk_length = length_samples // chunks
 
-        self._process_command(command, stdout=PIPE)
+        LOGGER.debug('Extracting in %s sub-chunks of ~%s sample(s) ...', chunks, chunk_length)
+
+        with TemporaryDirectory(dir=str(target_file.parent)) as tmp_dir:
+            part_files = []
+            commands = []
+
+            for idx in range(chunks):
+                pos_start = pos_start_samples + idx * chunk_length
+                length = chunk_length if idx < chunks - 1 else length_samples - chunk_length * idx
+                part_file = Path(tmp_dir) / f'{idx}.wav'
+                part_files.append(part_file)
+                commands.append([
+                    *self._sox_base, str(source_file), str(part_file),
+                    'trim', f'{pos_start}s', f'{length}s',
+                ])
+
+            self._run_jobs(self._process_sox_command, [dict(command=command) for command in commands])
+
+            return self._process_sox_command([
+                *self._sox_base, *(str(part_file) for part_file in part_files),
+                '--comment=', *add_comment, str(target_file),
+            ])
 
     def process_cue(self, *, cue_file: Path, target_path: Path):
         """Parses .cue file, extracts separate tracks.
@@ -241,10 +457,9 @@ class Deflacue:
         :param target_path: path to place files into
 
         """
-        LOGGER.info(f'\nProcessing `{cue_file.name}`\n')
+        LOGGER.info('\nProcessing `%s`\n', cue_file.name)
 
-        parser = CueParser.from_file(fpath=cue_file, encoding=self.encoding)
-        cue = parser.run()
+        cue = _parse_cue(str(cue_file), cue_file.stat().st_mtime, self.encoding)
 
         cd_info = cue.meta.data
         tracks = cue.tracks
@@ -260,23 +475,57 @@ class Deflacue:
         self._create_target_path(bundle_path)
 
         len_tracks_count = len(str(len(tracks)))
+        extractions = []
+
         for track in tracks:
-            track_file = track.file.path
+            # Resolve files relative to the .cue sheet location
+            # not to rely on the current working directory.
+            track_file = cue_file.parent / track.file.path
 
             if not track_file.exists():
-                LOGGER.error(f'Source file `{track_file}` is not found. Track is skipped.')
+                LOGGER.error('Source file `%s` is not found. Track is skipped.', track_file)
                 continue
 
             track_num = str(track.num).rjust(len_tracks_count, '0')
             filename = f"{track_num} - {sanitize(track.title)}.flac"
+            target_file = bundle_path / filename
 
-            self.sox_extract_audio(
+            if not self._force and target_file.exists():
+                target_stat = target_file.stat()
+
+                if target_stat.st_size and target_stat.st_mtime >= track_file.stat().st_mtime:
+                    LOGGER.info('  Skipped existing `%s`.', target_file.name)
+                    continue
+
+            extractions.append(dict(
                 source_file=track_file,
                 pos_start_samples=track.start,
                 pos_end_samples=track.end,
-                target_file=bundle_path / filename,
+                target_file=target_file,
                 metadata=track.data
-            )
+            ))
+
+        self._run_jobs(self.sox_extract_audio, extractions)
+
+    def _run_jobs(self, func, kwargs_list: List[dict]):
+        """Runs jobs, in parallel if allowed.
+
+        :param func: Callable to run for every job.
+
+        :param kwargs_list: Keyword argument dicts, one per job.
+
+        """
+        if self._dry_run or self.jobs < 2 or len(kwargs_list) < 2:
+            # Sequential run keeps log ordering deterministic.
+            for kwargs in kwargs_list:
+                func(**kwargs)
+            return
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            # Threads are enough: the actual work is done by SoX child processes.
+            futures = [executor.submit(func, **kwargs) for kwargs in kwargs_list]
+            for future in futures:
+                future.result()
 
     def do(self, *, recursive: bool = False):
         """Main method processing .cue files in batch.
@@ -286,13 +535,12 @@ class Deflacue:
         """
         self._create_target_path(self.path_target)
 
-        files_dict = self.filter_target_extensions(self.get_dir_files(recursive=recursive))
+        files_dict = self.get_cue_files(recursive=recursive)
 
-        dir_initial = os.getcwd()
         paths = sorted(files_dict.keys())
+        queue = []
 
         for path in paths:
-            os.chdir(path)
 
             LOGGER.info(f"\n{'====' * 10}\nWorking on: {path}\n")
 
@@ -311,8 +559,8 @@ class Deflacue:
             LOGGER.info(f'Target (output) path: {target_path}')
 
             for cue in files_dict[path]:
-                self.process_cue(cue_file=path / cue, target_path=target_path)
+                queue.append(dict(cue_file=path / cue, target_path=target_path))
 
-        os.chdir(dir_initial)
+        self._run_jobs(self.process_cue, queue)
 
         LOGGER.info('We are done. Thank you.\n')
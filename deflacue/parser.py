@@ -1,5 +1,5 @@
 import logging
-from copy import deepcopy
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional, Tuple
 
@@ -7,26 +7,35 @@ from .exceptions import ParserError
 
 LOGGER = logging.getLogger(__name__)
 
+SAMPLE_RATE = 44100
+"""Audio CD sampling rate, Hz."""
 
-def pos_to_frames(pos) -> int:
-    """Converts position (mm:ss:ff) into frames.
+FRAME_SAMPLES = SAMPLE_RATE // 75
+"""Samples per Cue Sheet frame (75 frames a second)."""
+
+
+@lru_cache(maxsize=None)
+def pos_to_frames(pos: str) -> int:
+    """Converts position (mm:ss:ff) into frames. Results are memoized:
+    common positions (e.g. standard pregaps) repeat across cue sheets.
 
     :param pos:
 
     """
     minutes, seconds, frames = map(int, pos.split(':'))
-    seconds = (minutes * 60) + seconds
-    rate = 44100
-    return (seconds * rate) + (frames * (rate // 75))
+    return ((minutes * 60) + seconds) * SAMPLE_RATE + frames * FRAME_SAMPLES
 
 
 class Context:
     """Basic context."""
 
+    __slots__ = ('data',)
+
     _default = {}
 
     def __init__(self, *, data: dict):
-        self.data = {**self._default, **deepcopy(data)}
+        # A shallow merge is enough: context data holds scalars only.
+        self.data = {**self._default, **data}
 
     def add(self, key: str, val: str):
         self.data[key] = val
@@ -35,6 +44,8 @@ class Context:
 class MetaContext(Context):
     """Global .cue meta context."""
 
+    __slots__ = ()
+
     _default = {
         'ALBUM': 'Unknown',
         'PERFORMER': 'Unknown',
@@ -50,6 +61,8 @@ class MetaContext(Context):
 class FileContext(Context):
     """File information."""
 
+    __slots__ = ('path', 'type', 'tracks')
+
     def __init__(self, *, path: str, ftype: str, data: dict):
         self.path: Path = Path(path)
         """File path."""
@@ -69,6 +82,8 @@ class FileContext(Context):
 class TrackContext(Context):
     """Track information."""
 
+    __slots__ = ('file', 'num', 'type', 'start', '_end')
+
     _default = {
         'TITLE': 'Unknown',
     }
@@ -86,6 +101,9 @@ class TrackContext(Context):
         self.start: int = 0
         """Start position (frames)."""
 
+        self._end: int = 0
+        """End position (frames). Filled by the parser."""
+
         super().__init__(data=file.data)
 
     def __str__(self):
@@ -97,25 +115,17 @@ class TrackContext(Context):
 
     @property
     def end(self) -> int:
-        tracks = self.file.tracks
-        end = 0
-
-        for idx, track in enumerate(tracks):
-            if track is self:
-                try:
-                    end = tracks[idx+1].start
-
-                except IndexError:
-                    pass
-
-                break
-
-        return end
+        return self._end
 
 
 class CueData:
     """Represents data from .cue file."""
 
+    __slots__ = (
+        'meta', 'files', 'tracks',
+        '_current_file', '_current_track', '_current_context',
+    )
+
     def __init__(self):
         self.meta = []
 
@@ -172,72 +182,101 @@ class CueParser:
 
         cue = CueData()
         parse_cmd = self._parse_command
-        unquote = self._unquote
+        dispatch = self._dispatch
+        handle_context = CueParser._handle_context
 
         for line in self.lines:
             cmd, args = parse_cmd(line)
+            dispatch.get(cmd, handle_context)(self, cue, cmd, args)
 
-            if cmd == 'REM':
-                cue.add_context(*parse_cmd(args))
+        for cue_file in cue.files:
+            # Every track ends where the next one in its file starts;
+            # the last track (end=0) spans up to the end of file.
+            tracks = cue_file.tracks
 
-            elif cmd == 'FILE':
-                fpath, ftype = args.rsplit(' ', 1)
-                fpath = unquote(fpath)
-                cue.add_file(path=fpath, ftype=ftype)
+            for idx, track in enumerate(tracks[1:]):
+                tracks[idx]._end = track.start
 
-            elif cmd == 'TRACK':
-                num, _, dtype = args.partition(' ')
-                cue.add_track(num=int(num), dtype=dtype)
+        return cue
 
-            elif cmd == 'INDEX':
-                num, _, pos = args.partition(' ')
+    def _handle_rem(self, cue: CueData, cmd: str, args: str):
+        cue.add_context(*self._parse_command(args))
 
-                if num == '01':
-                    cue.add_context(f'{cmd} {num}', pos)
-                    cue.add_track_index(pos=pos)
+    def _handle_file(self, cue: CueData, cmd: str, args: str):
+        fpath, ftype = args.rsplit(' ', 1)
+        cue.add_file(path=self._unquote(fpath), ftype=ftype)
 
-            else:
-                cue.add_context(cmd, args)
+    def _handle_track(self, cue: CueData, cmd: str, args: str):
+        num, _, dtype = args.partition(' ')
+        cue.add_track(num=int(num), dtype=dtype)
 
-        return cue
+    def _handle_index(self, cue: CueData, cmd: str, args: str):
+        num, _, pos = args.partition(' ')
+
+        if num == '01':
+            cue.add_context(f'{cmd} {num}', pos)
+            cue.add_track_index(pos=pos)
+
+    def _handle_context(self, cue: CueData, cmd: str, args: str):
+        cue.add_context(cmd, args)
+
+    _dispatch = {
+        'REM': _handle_rem,
+        'FILE': _handle_file,
+        'TRACK': _handle_track,
+        'INDEX': _handle_index,
+    }
+    """Cue commands to handlers. Unlisted commands become context data."""
 
     def _parse_command(self, cmd: str) -> Tuple[str, str]:
         command, _, args = cmd.partition(' ')
         args = self._unquote(args)
 
-        LOGGER.debug(f'Parsed command `{command}`. Args: {args}')
+        LOGGER.debug('Parsed command `%s`. Args: %s', command, args)
 
         return command, args
 
     @classmethod
     def _unquote(cls, val: str) -> str:
-        return val.strip(' "')
+        val = val.strip()
+
+        if len(val) > 1 and val[0] == '"' and val[-1] == '"':
+            return val[1:-1]
+
+        return val
 
     @classmethod
     def from_file(cls, fpath: Path, *, encoding: str = None) -> 'CueParser':
 
-        def read(coding: str = None) -> Optional[CueParser]:
+        # Cue files are small: read the bytes in one go and decode
+        # in memory instead of paying for the text I/O stack, possibly twice.
+        data = Path(fpath).read_bytes()
+
+        def decode(coding: str = None) -> Optional[str]:
 
             try:
-                with open(str(fpath), encoding=coding) as f:
-                    return CueParser([
-                        line.strip() for line in f.readlines()
-                        if line.strip()
-                    ])
+                return data.decode(coding) if coding else data.decode()
 
             except UnicodeDecodeError:
                 return None
 
-        parser = read(encoding)
+        text = decode(encoding)
 
-        if not parser:
+        if text is None and encoding:
             # Try unicode as a fallback.
-            parser = read()
+            text = decode()
 
-        if not parser:
+        if text is None:
             raise ParserError(
                 'Unable to read data from .cue file. '
                 'Please provide a correct encoding.'
             )
 
-        return parser
+        lines = []
+        for line in text.splitlines():
+            line = line.strip()
+
+            if line:
+                lines.append(line)
+
+        return CueParser(lines)
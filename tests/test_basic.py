@@ -5,7 +5,7 @@ from pathlib import Path
 import pytest
 
 from deflacue.deflacue import CueParser, Deflacue
-from deflacue.exceptions import ParserError
+from deflacue.exceptions import DeflacueError, ParserError
 
 
 class TestParser:
@@ -63,8 +63,13 @@ def sox_mock(monkeypatch):
             self.results = deque()
 
         def process_command(self, command, **kwargs):
-            logging.getLogger('deflacue').debug(f'Executing shell command: {command}')
+            logging.getLogger('deflacue').debug(f'Executing command: {command}')
             self.commands.append(command)
+
+            if 'trim' in command:
+                # Mimic SoX writing its output file.
+                Path(command[command.index('trim') - 1]).write_bytes(b'flac')
+
             return 0
 
     mock = SoxMock()
@@ -75,6 +80,19 @@ def sox_mock(monkeypatch):
 
 class TestDeflacue:
 
+    def test_jobs_validation(self, tmp_path):
+
+        for jobs in (-1, 0):
+            with pytest.raises(DeflacueError):
+                Deflacue(source_path=str(tmp_path), jobs=jobs)
+
+    def test_sox_missing(self, tmp_path):
+
+        deflacue = Deflacue(source_path=str(tmp_path))
+        deflacue._sox_executable = str(tmp_path / 'nosox')
+
+        assert not deflacue.sox_check_is_available()
+
     def test_basic(self, datafix_dir, sox_mock, tmp_path, caplog):
 
         caplog.set_level(logging.DEBUG, logger='deflacue')
@@ -99,4 +117,102 @@ class TestDeflacue:
         caplog_text = caplog.text
         assert 'Extracting `5 - 05. История болезни.flac`' in caplog_text
         assert 'Еще Не Вечер.flac` is not found.' in caplog_text
-        assert '--add-comment="TRACKNUMBER=4"' in caplog_text
+        assert '--add-comment=TRACKNUMBER=4' in caplog_text
+
+    def test_skip_existing(self, datafix_dir, sox_mock, tmp_path, caplog):
+
+        caplog.set_level(logging.INFO, logger='deflacue')
+
+        kwargs = dict(
+            source_path=str(datafix_dir),
+            dest_path=str(tmp_path / 'sub'),
+            encoding='cp1251',
+        )
+        commands = sox_mock.commands
+
+        deflacue = Deflacue(**kwargs)
+        deflacue.do(recursive=True)
+        assert len(commands) == 5
+
+        # Targets from the first run are complete, so the re-run skips them all.
+        deflacue.do(recursive=True)
+        assert len(commands) == 5
+        assert 'Skipped existing' in caplog.text
+
+        # Unless forced.
+        deflacue = Deflacue(force=True, **kwargs)
+        deflacue.do(recursive=True)
+        assert len(commands) == 10
+
+    def test_jobs_same_commands(self, datafix_dir, sox_mock, tmp_path):
+
+        threading_flags = {'--single-threaded', '--multi-threaded'}
+        commands = sox_mock.commands
+
+        def extract(jobs: int):
+            commands.clear()
+
+            deflacue = Deflacue(
+                source_path=str(datafix_dir),
+                dest_path=str(tmp_path / 'sub'),
+                encoding='cp1251',
+                jobs=jobs,
+                force=True,
+            )
+            deflacue.do(recursive=True)
+
+            # Only the SoX threading flag may differ between the runs.
+            return sorted(
+                tuple(arg for arg in command if arg not in threading_flags)
+                for command in commands
+            )
+
+        serial = extract(jobs=1)
+        assert len(serial) == 5
+        assert extract(jobs=4) == serial
+
+    def test_chunked_extraction(self, datafix_dir, sox_mock, tmp_path):
+
+        deflacue = Deflacue(
+            source_path=str(datafix_dir),
+            dest_path=str(tmp_path),
+            encoding='cp1251',
+            jobs=2,
+        )
+        deflacue._split_threshold = 100000
+
+        pos_start = 1000
+        length = 250000
+
+        deflacue.sox_extract_audio(
+            source_file=datafix_dir / '01. Сторона А.flac',
+            pos_start_samples=pos_start,
+            pos_end_samples=pos_start + length,
+            target_file=tmp_path / 'track.flac',
+            metadata={'TITLE': 'Some', 'TRACK_NUM': '1'},
+        )
+
+        *part_commands, concat_command = sox_mock.commands
+
+        trims = []
+        for command in part_commands:
+            idx = command.index('trim')
+            trims.append((int(command[idx + 1][:-1]), int(command[idx + 2][:-1])))
+
+        trims.sort()
+        assert len(trims) == 2
+
+        # Sub-chunks are contiguous and cover the whole track.
+        expected_start = pos_start
+        for chunk_start, chunk_length in trims:
+            assert chunk_start == expected_start
+            expected_start += chunk_length
+
+        assert sum(chunk_length for _, chunk_length in trims) == length
+
+        # The concatenation pass joins every part and carries the tags.
+        part_targets = sorted(command[command.index('trim') - 1] for command in part_commands)
+        assert sorted(arg for arg in concat_command if arg.endswith('.wav')) == part_targets
+        assert '--add-comment=TITLE=Some' in concat_command
+        assert '--add-comment=TRACKNUMBER=1' in concat_command
+        assert concat_command[-1].endswith('.tmp.flac')